@@ -1,6 +1,7 @@
 import re
-from .core import ChunkExpr, Chunks, Corpus
+from .core import ChunkExpr, Chunks, Corpus, _literal_alternates
 import polars as pl
+import pyarrow as pa
 
 
 __all__ = [
@@ -8,6 +9,10 @@ __all__ = [
     "RegexMatchChunk",
 ]
 
+# Seed for hashing chunk IDs. Kept fixed so the same chunks get the same IDs across
+# runs (for a given Polars version).
+_ID_SEED = 0
+
 
 class FixedSizeChunk(ChunkExpr):
     """
@@ -55,27 +60,48 @@ class FixedSizeChunk(ChunkExpr):
                 "Fixed-size chunking requires the atoms to have `ordinal` column, but none was found."
             )
 
-        # We need chunk-per-atom data so that chunks can be properly ordered.
-        joined = (
-            pl.from_arrow(corpus.chunk(self.constraint).chunk_atoms)
-            .rename({"chunk": "constraint"})
-            .join(pl.from_arrow(corpus.atoms), left_on="atom", right_on="id")
+        every = self.size + self.offset
+
+        # Windows are based on each atom's (dense, 0-based) position within its
+        # constraint, so every chunk has `size` atoms even if ordinals have gaps.
+        # (The constraint's atoms are sorted once and cached, so this is just a
+        # numbering pass.)
+        positioned = (
+            corpus.chunk(self.constraint)
+            .ordered_atoms.lazy()
+            .select(pl.col("chunk").alias("constraint"), "atom")
+            .with_columns(
+                pl.int_range(pl.len(), dtype=pl.Int64).over("constraint").alias("pos")
+            )
         )
 
-        chunks = (
-            joined.sort(["constraint", "ordinal"])
-            .group_by_dynamic(
-                pl.col("ordinal").cast(pl.Int64),
-                every=f"{self.size + self.offset}i",
+        if self.closed == "left" and self.offset >= 0:
+            # Disjoint windows: each atom is in at most one chunk, which can be found
+            # with integer arithmetic instead of a dynamic window search. (Atoms are
+            # already in constraint/reading order, so keep chunks in that order too.)
+            chunks = (
+                positioned.filter(pl.col("pos") % every < self.size)
+                .group_by(
+                    pl.col("constraint"),
+                    (pl.col("pos") // every * every).alias("pos"),
+                    maintain_order=True,
+                )
+                .agg(pl.col("atom"))
+            )
+        else:
+            chunks = positioned.group_by_dynamic(
+                pl.col("pos"),
+                every=f"{every}i",
                 period=f"{self.size}i",
                 closed=self.closed,
                 group_by="constraint",
                 start_by="datapoint",
-            )
-            .agg(pl.col("atom"))
-            .with_columns(
-                pl.struct(pl.col("constraint", "ordinal")).hash().alias("id"),
-            )
+            ).agg(pl.col("atom"))
+
+        chunks = chunks.collect()
+        # Hash window positions to get unique chunk IDs.
+        chunks = chunks.with_columns(
+            chunks.select("constraint", "pos").hash_rows(seed=_ID_SEED).alias("id")
         )
 
         return Chunks(
@@ -112,6 +138,37 @@ class RegexMatchChunk(ChunkExpr):
     ):
         self.constraint = constrain_to
         self.pattern = pattern
+        # Compile once, so repeated calls don't pay for pattern lookup/compilation.
+        self._compiled = re.compile(pattern)
+        # Literal patterns can skip the regex engine entirely.
+        self._literals = _literal_alternates(pattern)
+
+    def _match_spans(self, texts: pl.Series) -> pl.Series:
+        """
+        Find the `(start, end)` span of every match in each string of `texts`.
+
+        Spans are collected into flat offset/start/end buffers and assembled into a
+        single Arrow `ListArray` of structs, rather than building Python dicts for
+        every match.
+        """
+        offsets, starts, ends = [0], [], []
+        for text in texts:
+            if text is not None:
+                for m in self._compiled.finditer(text):
+                    start, end = m.span()
+                    starts.append(start)
+                    ends.append(end)
+            offsets.append(len(starts))
+
+        spans = pa.ListArray.from_arrays(
+            pa.array(offsets, type=pa.int32()),
+            pa.StructArray.from_arrays(
+                [pa.array(starts, type=pa.int64()), pa.array(ends, type=pa.int64())],
+                names=["start", "end"],
+            ),
+        )
+
+        return pl.from_arrow(spans)
 
     def __call__(self, corpus: Corpus) -> Chunks:
         if "ordinal" not in corpus.atoms.schema.names:
@@ -123,68 +180,99 @@ class RegexMatchChunk(ChunkExpr):
         # be modifyable in the future...
         SPACER = " "
 
-        # We need chunk-per-atom data so that chunks can be properly ordered.
-        joined = (
-            pl.from_arrow(corpus.chunk(self.constraint).chunk_atoms)
-            .rename({"chunk": "constraint"})
-            .join(pl.from_arrow(corpus.atoms), left_on="atom", right_on="id")
-        )
-        indices = joined.sort(["constraint", "ordinal"]).select(
-            pl.col("constraint"),
-            pl.col("atom"),
-            pl.col("text")
-            .str.len_chars()
-            .add(pl.lit(SPACER).str.len_chars())
-            .cum_sum()
-            .shift(1, fill_value=0)
-            .over(["constraint"])
-            .alias("start_index"),
+        # Each constraint's joined text, and each atom's offset within the whole
+        # (sorted) table as if every constraint's text were laid end-to-end. Offsets
+        # are strictly increasing, so atoms can be located with a binary search
+        # instead of a join. (Cached on the constraint's chunks, so repeated
+        # expressions don't redo the join. Python's regex engine reports character
+        # offsets; Polars' literal matching reports byte offsets.)
+        indices, grouped = corpus.chunk(self.constraint).joined_text(
+            SPACER, unit="chars" if self._literals is None else "bytes"
         )
+        grouped = grouped.lazy().rename({"chunk": "constraint"})
 
-        chunks = (
-            joined.sort(["constraint", "ordinal"])
-            .group_by(["constraint"])
-            .agg(
-                pl.col("text")
-                .str.join(SPACER)
-                .map_elements(
-                    lambda x: [
-                        dict(zip(["start", "end"], m.span()))
-                        for m in re.finditer(self.pattern, x)
-                    ],
-                    return_dtype=pl.List(
-                        pl.Struct({"start": pl.Int64, "end": pl.Int64})
-                    ),
+        if self._literals is None:
+            # Run the regex over each constraint's text in one batch.
+            matches = (
+                grouped.select(
+                    pl.col("constraint"),
+                    pl.col("base"),
+                    pl.col("text")
+                    .map_batches(
+                        self._match_spans,
+                        return_dtype=pl.List(
+                            pl.Struct({"start": pl.Int64, "end": pl.Int64})
+                        ),
+                    )
+                    .alias("match"),
                 )
-                .alias("match")
+                .explode("match")
+                .drop_nulls("match")
+                .unnest("match")
             )
-            .explode("match")
-            # Join/filter where start_index is between `match` start/end values
-            .join(indices, on="constraint")
-            .filter(
-                pl.col("start_index").is_between(
-                    pl.col("match").struct.field("start"),
-                    pl.col("match").struct.field("end"),
+        else:
+            # Aho-Corasick multi-pattern matching, for (alternations of) literals.
+            matches = (
+                grouped.select(
+                    pl.col("constraint"),
+                    pl.col("base"),
+                    pl.col("text").str.find_many(self._literals).alias("start"),
+                    pl.col("text")
+                    .str.extract_many(self._literals)
+                    .list.eval(pl.element().str.len_bytes())
+                    .alias("length"),
                 )
-            )
-            # Our chunks are anywhere with unique `constraint`s and `match`es. Here
-            # we'll "unnest" the match struct by accessing the start and end fields.
-            .group_by(
-                pl.struct(
-                    "constraint",
-                    pl.col("match").struct.field("start"),
-                    pl.col("match").struct.field("end"),
+                .explode("start", "length")
+                .drop_nulls("start")
+                .select(
+                    pl.col("constraint"),
+                    pl.col("base"),
+                    pl.col("start").cast(pl.Int64),
+                    (pl.col("start") + pl.col("length")).cast(pl.Int64).alias("end"),
                 )
-                .hash()  # Hash to get unique chunk IDs.
-                .alias("id"),
             )
-            .agg("atom")
+
+        matches = matches.collect()
+
+        # Our chunks are anywhere with unique `constraint`s and `match`es. Hash them
+        # to get unique chunk IDs.
+        ids = matches.select("constraint", "start", "end").hash_rows(seed=_ID_SEED)
+
+        # Atoms belong to a match if they start anywhere within it (inclusive).
+        # Both offsets and matches are sorted within each constraint, so each match
+        # maps to a contiguous range of atom rows.
+        start_index = indices.get_column("start_index")
+        atom_rows = (
+            pl.DataFrame(
+                {
+                    "chunk": ids,
+                    "row": pl.int_ranges(
+                        start_index.search_sorted(
+                            matches.get_column("base") + matches.get_column("start"),
+                            side="left",
+                        ),
+                        start_index.search_sorted(
+                            matches.get_column("base") + matches.get_column("end"),
+                            side="right",
+                        ),
+                        eager=True,
+                    ),
+                }
+            )
+            .explode("row")
+            .drop_nulls("row")
+        )
+
+        chunk_atoms = atom_rows.select(
+            pl.col("chunk"),
+            indices.get_column("atom").gather(atom_rows.get_column("row")),
         )
 
         return Chunks(
             corpus=corpus,
-            chunks=chunks.select("id").to_arrow(),
-            chunk_atoms=chunks.select(pl.col("id").alias("chunk"), "atom")
-            .explode("atom")
-            .to_arrow(),
+            # (Matches that don't contain the start of any atom aren't chunks.)
+            chunks=chunk_atoms.select(
+                pl.col("chunk").unique(maintain_order=True).alias("id")
+            ).to_arrow(),
+            chunk_atoms=chunk_atoms.to_arrow(),
         )
@@ -1,8 +1,16 @@
 from __future__ import annotations  # For circular/"forward reference" annotations
 from abc import ABC, abstractmethod
+import polars as pl
 import pyarrow as pa
+import pyarrow.compute
+import re
 
-from typing import Collection
+from typing import Collection, Literal
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
 
 __all__ = [
     "Corpus",
@@ -13,6 +21,64 @@ __all__ = [
 ]
 
 
+def _sorted_rows(sorted_ids: pl.Series, ids: pl.Series) -> pl.Series:
+    """
+    Find the row of each of `ids` in `sorted_ids` with a binary search. IDs that
+    aren't found get nulls.
+    """
+    if sorted_ids.is_empty():
+        return pl.repeat(None, len(ids), dtype=pl.UInt32, eager=True)
+
+    rows = sorted_ids.search_sorted(ids)
+    # `search_sorted` gives insertion points, so check the IDs actually match.
+    found = sorted_ids.gather(rows.clip(upper_bound=len(sorted_ids) - 1)) == ids
+
+    return pl.select(pl.when(found).then(rows)).to_series()
+
+
+def _literal_alternates(pattern: str, flags: int = 0) -> list[str] | None:
+    """
+    If `pattern` is a plain literal (`"abc"`) or an alternation of plain literals
+    (`"abc|def|g"`), return those literals; otherwise return `None`.
+
+    Literal alternations can be matched with a multi-pattern (Aho-Corasick) automaton,
+    which is much faster than a regex engine. To guarantee the same matches as the
+    regex's leftmost-first semantics, literals must all be non-empty and none can be a
+    substring of another.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+
+    # Flags like `re.IGNORECASE` (inline or not) change what literals match.
+    if parsed.state.flags & ~re.UNICODE:
+        return None
+
+    def as_literal(items) -> str | None:
+        if not items or any(op is not sre_parse.LITERAL for op, _ in items):
+            return None
+        return "".join(chr(char) for _, char in items)
+
+    items = list(parsed)
+    if len(items) == 1 and items[0][0] is sre_parse.BRANCH:
+        literals = [as_literal(branch) for branch in items[0][1][1]]
+    elif len(items) == 1 and items[0][0] is sre_parse.IN:
+        # Single-character alternations (`"a|b"`) get parsed into a character set.
+        literals = [as_literal([item]) for item in items[0][1]]
+    else:
+        literals = [as_literal(items)]
+
+    if any(literal is None for literal in literals):
+        return None
+
+    literals = list(dict.fromkeys(literals))
+    if any(a in b for a in literals for b in literals if a is not b):
+        return None
+
+    return literals
+
+
 class ChunkExpr(ABC):
     """
     `ChunkExpr`s are expressions for *chunking* documents in a `Corpus`.
@@ -88,6 +154,62 @@ class Corpus:
         self.chunks = {}
         self.atoms = atoms
 
+    @property
+    def atoms(self) -> pa.Table:
+        "Table of the corpus' atoms."
+        return self._atoms
+
+    @atoms.setter
+    def atoms(self, atoms: pa.Table):
+        self._atoms = atoms
+        self._atoms_pl = None
+        self._atoms_by_id = None
+
+    @property
+    def atoms_pl(self) -> pl.DataFrame:
+        """
+        A (cached) Polars view of `atoms`. Shares memory with the Arrow table, so
+        expressions can use it freely instead of re-converting `atoms` every time.
+        """
+        if self._atoms_pl is None:
+            self._atoms_pl = pl.from_arrow(self.atoms, rechunk=False)
+        return self._atoms_pl
+
+    @property
+    def atoms_by_id(self) -> pl.DataFrame:
+        """
+        A (cached) Polars view of `atoms`, sorted by `id`. Used to look atoms up by ID
+        without a join; see `Corpus.atom_rows()`.
+        """
+        if self._atoms_by_id is None:
+            atoms = self.atoms_pl
+            if atoms.get_column("id").is_sorted():
+                # Atoms loaded in ID order can be shared as-is (an O(n) check,
+                # rather than an O(n log n) sort and a copy).
+                self._atoms_by_id = atoms.with_columns(pl.col("id").set_sorted())
+            else:
+                self._atoms_by_id = atoms.sort("id")
+        return self._atoms_by_id
+
+    def atom_rows(self, atom_ids: pl.Series) -> pl.Series:
+        """
+        Find the row of each atom ID in `atoms_by_id`, via a binary search over the
+        sorted IDs (rather than building a hash table over all atoms for a join).
+
+        Parameters
+        ----------
+        atom_ids
+            Atom IDs to look up.
+
+        Returns
+        -------
+        pl.Series
+            Row indices into `atoms_by_id`, in the same order as `atom_ids`. IDs that
+            don't match an atom get nulls. Atom attributes can then be fetched with
+            e.g. `corpus.atoms_by_id.get_column("text").gather(rows)`.
+        """
+        return _sorted_rows(self.atoms_by_id.get_column("id"), atom_ids)
+
     def chunk(self, chunk_expr: ChunkExpr | str) -> Chunks:
         """
         Access an existing collection of chunks in the corpus, or ephemerally
@@ -196,6 +318,211 @@ class Chunks:
         self.chunks = chunks
         self.chunk_atoms = chunk_atoms
 
+    @property
+    def chunks(self) -> pa.Table:
+        "Table of individual chunks and their attributes."
+        return self._chunks
+
+    @chunks.setter
+    def chunks(self, chunks: pa.Table):
+        self._chunks = chunks
+        self._chunks_pl = None
+
+    @property
+    def chunk_atoms(self) -> pa.Table:
+        "Chunk/atom relationship table."
+        return self._chunk_atoms
+
+    @chunk_atoms.setter
+    def chunk_atoms(self, chunk_atoms: pa.Table):
+        self._chunk_atoms = chunk_atoms
+        self._chunk_atoms_pl = None
+        self._atom_lists = None
+        self._ordered_atoms = None
+        self._joined_text = {}
+
+    @property
+    def chunks_pl(self) -> pl.DataFrame:
+        "A (cached, zero-copy) Polars view of `chunks`."
+        if self._chunks_pl is None:
+            self._chunks_pl = pl.from_arrow(self.chunks, rechunk=False)
+        return self._chunks_pl
+
+    @property
+    def chunk_atoms_pl(self) -> pl.DataFrame:
+        "A (cached, zero-copy) Polars view of `chunk_atoms`."
+        if self._chunk_atoms_pl is None:
+            self._chunk_atoms_pl = pl.from_arrow(self.chunk_atoms, rechunk=False)
+        return self._chunk_atoms_pl
+
+    @property
+    def atom_lists(self) -> pl.DataFrame:
+        """
+        A (cached) table of each chunk's atom IDs, as one list per chunk (i.e.
+        `chunk_atoms` grouped by `chunk`). Sorted by `chunk`, so chunks can be looked
+        up without a join.
+        """
+        if self._atom_lists is None:
+            self._atom_lists = (
+                self.chunk_atoms_pl.group_by("chunk").agg("atom").sort("chunk")
+            )
+        return self._atom_lists
+
+    @property
+    def ordered_atoms(self) -> pl.DataFrame:
+        """
+        A (cached) table of the chunks' atoms in reading order: `chunk`, `atom`,
+        `ordinal`, and `row` (the atom's row in `corpus.atoms_by_id`), sorted by
+        `chunk` then `ordinal`. Atoms that aren't in the corpus are left out.
+
+        Sorting once here means chunkers and stringifiers that need atoms in order
+        don't each have to re-join and re-sort them.
+        """
+        atoms_table = self.corpus.atoms
+        if "ordinal" not in atoms_table.schema.names:
+            raise KeyError(
+                "Ordering atoms requires the atoms to have `ordinal` column, but none was found."
+            )
+
+        # (Also keyed on the atoms table, in case the corpus' atoms are replaced.)
+        if self._ordered_atoms is None or self._ordered_atoms[0] is not atoms_table:
+            corpus = self.corpus
+            rows = corpus.atom_rows(self.chunk_atoms_pl.get_column("atom"))
+            ordered = (
+                self.chunk_atoms_pl.select(
+                    "chunk",
+                    "atom",
+                    corpus.atoms_by_id.get_column("ordinal").gather(rows),
+                    rows.alias("row"),
+                )
+                .filter(rows.is_not_null())
+                .sort(["chunk", "ordinal"])
+            )
+            self._ordered_atoms = (atoms_table, ordered)
+
+        return self._ordered_atoms[1]
+
+    def joined_text(
+        self, spacer: str = " ", unit: Literal["chars", "bytes"] = "chars"
+    ) -> tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Join the text of each chunk's atoms (in `ordinal` order) into one string per
+        chunk. Cached per `(spacer, unit)`, since this is a full pass over every atom's
+        text that many expressions need.
+
+        Parameters
+        ----------
+        spacer
+            String to put between atoms' text.
+        unit : {"chars", "bytes"}
+            Unit for `start_index` offsets: characters (as Python's `re` reports) or
+            UTF-8 bytes (as Polars' string functions report).
+
+        Returns
+        -------
+        atoms : pl.DataFrame
+            `chunk`, `atom` and `start_index` for every atom in the chunks, sorted by
+            chunk and ordinal. `start_index` is the atom's offset as if every chunk's
+            text were laid end-to-end (so it's strictly increasing).
+        texts : pl.DataFrame
+            `chunk`, its joined `text`, and `base` (the `start_index` where the
+            chunk's text begins). Sorted by `chunk`.
+        """
+        atoms_table = self.corpus.atoms
+        for name in ("text", "ordinal"):
+            if name not in atoms_table.schema.names:
+                raise KeyError(
+                    f"Joining text requires the atoms to have `{name}` column, but none was found."
+                )
+
+        key = (spacer, unit)
+        # (Also keyed on the atoms table, in case the corpus' atoms are replaced.)
+        cached = self._joined_text.get(key)
+        if cached is not None and cached[0] is atoms_table:
+            return cached[1]
+
+        if unit == "chars":
+            text_len = pl.col("text").str.len_chars()
+            spacer_len = len(spacer)
+        else:
+            text_len = pl.col("text").str.len_bytes()
+            spacer_len = len(spacer.encode())
+
+        ordered = self.ordered_atoms
+        atoms = (
+            ordered.lazy()
+            .with_columns(
+                self.corpus.atoms_by_id.get_column("text").gather(
+                    ordered.get_column("row")
+                )
+            )
+            .with_columns(
+                # (Lengths are `uint32`; widen first so offsets can't wrap.)
+                text_len.add(spacer_len)
+                .cast(pl.Int64)
+                .cum_sum()
+                .shift(1, fill_value=0)
+                .alias("start_index"),
+            )
+        )
+        texts = atoms.group_by("chunk", maintain_order=True).agg(
+            pl.col("text").str.join(spacer),
+            pl.col("start_index").first().alias("base"),
+        )
+
+        # Run both queries together, so their shared work is only done once.
+        atoms, texts = pl.collect_all(
+            [atoms.select("chunk", "atom", "start_index"), texts]
+        )
+
+        self._joined_text[key] = (atoms_table, (atoms, texts))
+        return atoms, texts
+
+    def atom_data(self, *columns: str) -> pl.DataFrame:
+        """
+        Get atom attributes for each chunk, as lists with one value per atom.
+
+        Parameters
+        ----------
+        columns
+            Names of the atom attributes to get.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per chunk, in the same order as `chunks`, with a list column for
+            each attribute. Chunks without any atoms get nulls. Order within each
+            list is not guaranteed.
+        """
+        lists = self.atom_lists
+
+        # Find each chunk's list of atom IDs
+        rows = _sorted_rows(lists.get_column("chunk"), self.chunks_pl.get_column("id"))
+        atom_ids = lists.get_column("atom").gather(rows).to_arrow()
+
+        # Look up all atoms at once, then re-split the values into per-chunk lists
+        # using the ID lists' offsets.
+        atom_rows = self.corpus.atom_rows(pl.from_arrow(atom_ids.flatten()))
+        values = self.corpus.atoms_by_id.select(pl.col(*columns).gather(atom_rows))
+
+        lengths = pl.from_arrow(pa.compute.list_value_length(atom_ids)).fill_null(0)
+        offsets = pl.concat(
+            [pl.Series([0], dtype=pl.Int64), lengths.cast(pl.Int64).cum_sum()]
+        ).to_arrow()
+
+        return pl.DataFrame(
+            [
+                pl.from_arrow(
+                    pa.LargeListArray.from_arrays(
+                        offsets,
+                        values.get_column(c).to_arrow(),
+                        mask=atom_ids.is_null(),
+                    )
+                ).alias(c)
+                for c in columns
+            ]
+        )
+
     def __len__(self) -> int:
         "Get the number of chunks."
         return len(self.chunks)
@@ -216,7 +543,21 @@ class Chunks:
         for name, expr in exprs.items():
             enriched = enriched.append_column(name, expr(self))
 
-        return Chunks(corpus=self.corpus, chunks=enriched, chunk_atoms=self.chunk_atoms)
+        return self._replace_chunks(enriched)
+
+    def _replace_chunks(self, chunks: pa.Table) -> Chunks:
+        """
+        Make a new `Chunks` with different `chunks` (e.g. new attributes) but the same
+        `chunk_atoms`. Caches derived from `chunk_atoms` are shared, so a pipeline of
+        expressions doesn't rebuild them at every stage.
+        """
+        res = Chunks(corpus=self.corpus, chunks=chunks, chunk_atoms=self.chunk_atoms)
+        res._chunk_atoms_pl = self._chunk_atoms_pl
+        res._atom_lists = self._atom_lists
+        res._ordered_atoms = self._ordered_atoms
+        # (The same dict, so text joined by either object is reused by both.)
+        res._joined_text = self._joined_text
+        return res
 
     def filter(self, *filters) -> Chunks:
         """
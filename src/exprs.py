@@ -1,7 +1,8 @@
 import polars as pl
 import pyarrow as pa
+import pyarrow.compute
 import re
-from .core import AttrExpr, Chunks
+from .core import AttrExpr, Chunks, _literal_alternates, _sorted_rows
 
 from typing import Literal, List, Tuple, Union
 
@@ -33,19 +34,7 @@ class AtomData(AttrExpr):
         self.attr = attr
 
     def __call__(self, chunks: Chunks) -> pa.Array:
-        return (
-            # Start with `chunks` to ensure order and keep out unrelated atoms
-            pl.from_arrow(chunks.chunks)
-            .select(chunk="id")  # aliasing to "chunk"
-            # Find the atoms for these chunks
-            .join(pl.from_arrow(chunks.chunk_atoms), left_on="chunk", right_on="chunk")
-            # Join with individual atom data
-            .join(pl.from_arrow(chunks.corpus.atoms), left_on="atom", right_on="id")
-            .group_by("chunk", maintain_order=True)
-            .agg(self.attr)
-            .get_column(self.attr)
-            .to_arrow()
-        )
+        return chunks.atom_data(self.attr).get_column(self.attr).to_arrow()
 
 
 class RegexCount(AttrExpr):
@@ -53,6 +42,9 @@ class RegexCount(AttrExpr):
     Count how many matches to a regular expression exist in a given chunk, and add a
     regex match count column to the chunk attributes.
 
+    Matching is done with Polars' (Rust `regex` crate) engine, so patterns must use
+    that syntax—notably, look-arounds and backreferences are not supported.
+
     Parameters
     ----------
     stringifier
@@ -62,7 +54,8 @@ class RegexCount(AttrExpr):
         Regex pattern to match against.
     flags
         Regular expression flag(s). To include multiple flags you can combine them
-        using the bitwise OR operator "|".
+        using the bitwise OR operator "|". Supported flags are `re.IGNORECASE`,
+        `re.MULTILINE`, `re.DOTALL`, `re.VERBOSE` and `re.UNICODE` (the default).
     Examples
     --------
     Normal regex:
@@ -81,6 +74,15 @@ class RegexCount(AttrExpr):
     >>> RegexCount(chunks, flags=10)  # 2 + 8 == 10
     """
 
+    # Python `re` flags, and their inline equivalents in Polars' regex syntax.
+    _INLINE_FLAGS = {
+        re.IGNORECASE: "i",
+        re.MULTILINE: "m",
+        re.DOTALL: "s",
+        re.VERBOSE: "x",
+        re.UNICODE: "",  # Always on for Polars strings.
+    }
+
     def __init__(
         self, stringifier: AttrExpr, pattern: str, flags: Union[int, re.RegexFlag] = 0
     ):
@@ -88,19 +90,50 @@ class RegexCount(AttrExpr):
         self.pattern = pattern
         self.flags = flags
 
+        # Translate `flags` into an inline flag group, since Polars doesn't take flags.
+        inline = ""
+        unsupported = re.RegexFlag(flags)
+        for flag, char in self._INLINE_FLAGS.items():
+            if flags & flag:
+                inline += char
+                unsupported &= ~flag
+
+        if unsupported:
+            raise ValueError(
+                f"Unsupported regex flag(s) for `RegexCount`: {unsupported!r}. "
+                f"Supported flags: {list(self._INLINE_FLAGS.keys())}"
+            )
+
+        self._translated_pattern = f"(?{inline}){pattern}" if inline else pattern
+        # Literal patterns can skip the regex engine entirely.
+        self._literals = _literal_alternates(pattern, flags)
+
+        # Build the counting expression once, rather than re-deciding (and re-building
+        # it) on every call.
+        strings = pl.col("strings")
+        if self._literals is None:
+            counts = strings.str.count_matches(self._translated_pattern)
+        elif len(self._literals) == 1:
+            counts = strings.str.count_matches(self._literals[0], literal=True)
+        else:
+            # Aho-Corasick multi-pattern matching.
+            counts = strings.str.extract_many(self._literals).list.len()
+        self._counts = counts.cast(pl.Int64)
+
+        # Surface invalid patterns now, rather than when the expression is first used.
+        try:
+            pl.Series([""]).str.count_matches(self._translated_pattern)
+        except pl.exceptions.ComputeError as e:
+            raise ValueError(f"Invalid `RegexCount` pattern {pattern!r}: {e}") from e
+
     def __call__(self, chunks: Chunks) -> pa.Array:
         # (The stringifier is responsible for returning its strings
         # in the correct order for the input chunks.)
+        strings = pl.from_arrow(self.stringifier(chunks)).alias("strings")
 
-        strings = self.stringifier(chunks).to_pylist()
-
-        # There are probably faster ways to regex over a list (e.g. Polars can)
-        # but the built-in `re` module is definitely more familiar to people.
-        match_counts = [
-            len(re.findall(self.pattern, text, self.flags)) for text in strings
-        ]
+        counts = strings.to_frame().select(self._counts).to_series()
 
-        return pa.array(match_counts)
+        return counts.to_arrow()
 
 
 class ChunkOverlap(AttrExpr):
@@ -130,9 +163,9 @@ class ChunkOverlap(AttrExpr):
         self.agg = agg
 
         self.agg_exprs = {
-            "bool": pl.col("chunk_b").is_not_null().any(),
-            "count": pl.col("chunk_b").is_not_null().sum(),
-            "frac": pl.col("chunk_b").is_not_null().mean(),
+            "bool": pl.col("in_b").any(),
+            "count": pl.col("in_b").sum(),
+            "frac": pl.col("in_b").mean(),
         }
 
         if self.agg not in self.agg_exprs:
@@ -145,25 +178,28 @@ class ChunkOverlap(AttrExpr):
         of the `self.chunk_a` table.
         """
         corpus = chunks.corpus
+        b_atoms = corpus.chunk(self.chunk_b).chunk_atoms["atom"].combine_chunks()
+
+        # Flag chunk_a's atoms that are in any chunk_b. (A hash-set probe, rather than
+        # a join, so atoms in several chunk_bs are only counted once.)
+        in_b = pa.compute.is_in(chunks.chunk_atoms["atom"], value_set=b_atoms)
 
         overlaps = (
-            # Join chunk_a and chunk_b
-            pl.from_arrow(chunks.chunk_atoms)
-            .join(
-                pl.from_arrow(corpus.chunk(self.chunk_b).chunk_atoms).select(
-                    pl.col("chunk").alias("chunk_b"), "atom"
-                ),
-                on="atom",
-                how="left",
-            )
-            # .join(
-            #     pl.from_arrow(corpus["atom"]),
-            #     on="atom",
-            # )
-            # Aggregate shared atoms along chunk_a. Need to ensure order isn't messed up.
-            .group_by(pl.col("chunk"), maintain_order=True)
-            # Use selected aggregation method
+            chunks.chunk_atoms_pl.lazy()
+            .select("chunk", in_b=pl.from_arrow(in_b))
+            # Aggregate shared atoms along chunk_a, using selected aggregation method
+            .group_by("chunk")
             .agg(overlap=self.agg_exprs[self.agg])
+        )
+
+        # Start with `chunks` to ensure order
+        overlaps = (
+            chunks.chunks_pl.lazy()
+            .select(chunk="id")
+            .with_row_index("_order")
+            .join(overlaps, on="chunk", how="left")
+            .sort("_order")
+            .collect()
             .get_column("overlap")
         )
 
@@ -198,20 +234,14 @@ class SimpleStringify(AttrExpr):
                 "Stringifying requires the corpus' atoms to have an `ordinal` column, but none was found."
             )
 
-        # Figure out which atoms are in these chunks, and get all relevant atom attrs.
-        input_chunks = pl.from_arrow(chunks.chunks).select("id").rename({"id": "chunk"})
-        enriched = input_chunks.join(
-            pl.from_arrow(chunks.chunk_atoms),
-            on="chunk",
-        ).join(pl.from_arrow(atom).rename({"id": "atom"}), on="atom")
-
-        res = enriched.group_by(["chunk"]).agg(
-            pl.col("text").sort_by("ordinal").str.join(self.delimiter)
+        # Get each chunk's joined atom text (cached on `chunks`), and line it up with
+        # the input chunks.
+        _, texts = chunks.joined_text(self.delimiter)
+        rows = _sorted_rows(
+            texts.get_column("chunk"), chunks.chunks_pl.get_column("id")
         )
 
-        # Re-join with inputs to ensure correct ordering.
-        res = input_chunks.join(res, on="chunk", how="left").get_column("text")
-        # (`.get_column` makes a pl.Series)
+        res = texts.get_column("text").gather(rows)
 
         return res.to_arrow()  # Makes a pa.Array
 
@@ -237,62 +267,80 @@ class ChunkDelimitedStringify(AttrExpr):
     def __init__(
         self, chunk_delimiters: List[Tuple[str, str]], *, atom_delimiter: str = " "
     ):
+        # (Delimiter priorities are found with a 64-bit mask; one bit is reserved for
+        # `atom_delimiter`.)
+        if len(chunk_delimiters) > 63:
+            raise ValueError("At most 63 `chunk_delimiters` are supported.")
+
         self.chunk_delimiters = chunk_delimiters
         self.atom_delimiter = atom_delimiter
 
     def __call__(self, chunks: Chunks) -> pa.Array:
         # Get the original corpus/atom data.
         corpus = chunks.corpus
-        atoms = corpus.atoms
 
         # Figure out which atoms are in these chunks, and get all relevant atom attrs.
         # Results *must* be ordered according to the input chunks, hence the `left`
-        # joins and `maintain_order`s throughout (these maintain order in Polars)
+        # joins and the `_order` index (joins don't guarantee row order).
         enriched = (
-            pl.from_arrow(chunks.chunks)
-            .select("id")
+            chunks.chunks_pl.select("id")
             .rename({"id": "chunk"})
-            .join(pl.from_arrow(chunks.chunk_atoms), on="chunk", how="left")
-            .join(pl.from_arrow(atoms).rename({"id": "atom"}), on="atom", how="left")
+            .with_row_index("_order")
+            .join(chunks.chunk_atoms_pl, on="chunk", how="left")
         )
+        rows = corpus.atom_rows(enriched.get_column("atom"))
+        enriched = enriched.with_columns(
+            corpus.atoms_by_id.get_column("text").gather(rows),
+            corpus.atoms_by_id.get_column("ordinal").gather(rows),
+        ).lazy()
 
         for chunk, _ in self.chunk_delimiters:
             # Make sure there are not duplicate columns
-            if chunk in enriched.columns:
+            if chunk in enriched.collect_schema().names():
                 enriched = enriched.drop(chunk)
 
             # Get chunk IDs for applicable chunks, so we can identify diffs/changes.
             # (This involves reaching up into the full corpus for external chunk info.)
             enriched = enriched.join(
-                pl.from_arrow(corpus.chunk(chunk).chunk_atoms).select(
-                    pl.col("chunk").alias(chunk), "atom"
-                ),
+                corpus.chunk(chunk)
+                .chunk_atoms_pl.lazy()
+                .select(pl.col("chunk").alias(chunk), "atom"),
                 on="atom",
                 how="left",
             )
 
-        # Dynamically chain together an expression for conditional spacers
-        expr = pl
-        for chunk, delimiter in self.chunk_delimiters:
-            # Check if current chunk ID != next chunk ID
-            expr = expr.when(pl.col(chunk).ne(pl.col(chunk).shift(-1))).then(
-                pl.lit(delimiter)
-            )
-
-        # Set final row spacer to empty string to avoid trailing spaces
-        expr = expr.when(pl.int_range(0, pl.len()).eq(pl.len() - 1)).then(pl.lit(""))
-
-        # Add default delimiter (between atoms) to everything else.
-        expr = expr.otherwise(pl.lit(self.atom_delimiter))
+        # Find which delimiter follows each atom: the index of the first chunk type
+        # whose ID changes at the next atom, or the atom delimiter if none do.
+        delimiters = pl.Series(
+            [delimiter for _, delimiter in self.chunk_delimiters]
+            + [self.atom_delimiter]
+        )
+        # (Branch-free: each chunk type whose ID changes sets its bit in a mask, plus
+        # a sentinel bit for the atom delimiter. The lowest set bit is the winner.)
+        priority = pl.sum_horizontal(
+            *[
+                # Check if current chunk ID != next chunk ID
+                pl.col(chunk).ne(pl.col(chunk).shift(-1)).cast(pl.UInt64) * (1 << i)
+                for i, (chunk, _) in enumerate(self.chunk_delimiters)
+            ],
+            pl.lit(1 << len(self.chunk_delimiters), dtype=pl.UInt64),
+        ).bitwise_trailing_zeros()
+
+        expr = (
+            # Set final row spacer to empty string to avoid trailing spaces
+            pl.when(pl.int_range(0, pl.len()).eq(pl.len() - 1))
+            .then(pl.lit(""))
+            .otherwise(pl.lit(delimiters).gather(priority))
+        )
 
-        # Materialize the chunks.
+        # Materialize the chunks. Atoms are put in reading order first, so that
+        # "next atom" comparisons within each chunk are correct.
         results = (
-            enriched.group_by(["chunk"], maintain_order=True)
-            .agg(
-                text=(
-                    pl.concat_str(pl.col("text"), expr).sort_by("ordinal").str.join("")
-                )
-            )
+            enriched.sort(["_order", "ordinal"])
+            .group_by(["_order"])
+            .agg(text=pl.concat_str(pl.col("text"), expr).str.join(""))
+            .sort("_order")
+            .collect()
             .get_column("text")  # Result is a pl.Series
         )
 
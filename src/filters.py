@@ -1,11 +1,30 @@
 from .core import Chunks, ChunkFilter
 import pyarrow as pa
+import pyarrow.compute
 
 from typing import Collection, Literal
 
 __all__ = ["TopK", "Threshold", "EqualTo"]
 
 
+def _with_chunks(chunks: Chunks, filtered_chunks: pa.Table) -> Chunks:
+    """
+    Make a `Chunks` object from `filtered_chunks`, a subset of `chunks.chunks`,
+    with its `chunk_atoms` pruned down to just the remaining chunks (so downstream
+    joins don't have to scan atoms of chunks that were filtered out).
+    """
+    atom_mask = pa.compute.is_in(
+        chunks.chunk_atoms.column("chunk"),
+        value_set=filtered_chunks.column("id").combine_chunks(),
+    )
+
+    return Chunks(
+        corpus=chunks.corpus,
+        chunks=filtered_chunks,
+        chunk_atoms=chunks.chunk_atoms.filter(atom_mask),
+    )
+
+
 class TopK(ChunkFilter):
     """
     Selects the top `k` chunks from a given collection of chunks, based on
@@ -42,9 +61,7 @@ class TopK(ChunkFilter):
         # Convert indices to a boolean mask
         filtered_chunks = chunks.chunks.take(filtered_idxs)
 
-        return Chunks(
-            corpus=chunks.corpus, chunks=filtered_chunks, chunk_atoms=chunks.chunk_atoms
-        )
+        return _with_chunks(chunks, filtered_chunks)
 
 
 class Threshold(ChunkFilter):
@@ -96,11 +113,7 @@ class Threshold(ChunkFilter):
                     f"'`direction` must one of: '>', '>=', '<', '<='. Got `{self.direction}`"
                 )
 
-        return Chunks(
-            corpus=chunks.corpus,
-            chunks=chunks.chunks.filter(chunk_mask),
-            chunk_atoms=chunks.chunk_atoms,
-        )
+        return _with_chunks(chunks, chunks.chunks.filter(chunk_mask))
 
 
 class EqualTo(ChunkFilter):
@@ -132,8 +145,4 @@ class EqualTo(ChunkFilter):
 
         chunk_mask = pa.compute.is_in(values, pa.array(self.values))
 
-        return Chunks(
-            corpus=chunks.corpus,
-            chunks=chunks.chunks.filter(chunk_mask),
-            chunk_atoms=chunks.chunk_atoms,
-        )
+        return _with_chunks(chunks, chunks.chunks.filter(chunk_mask))
@@ -1,7 +1,9 @@
 from .ocr import (
     corpus_from_tesseract_table,
+    corpus_from_tesseract_tables,
 )
 
 __all__ = [
     "corpus_from_tesseract_table",
+    "corpus_from_tesseract_tables",
 ]
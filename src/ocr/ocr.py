@@ -1,85 +1,125 @@
 from retrievall.core import Chunks, Corpus
 import polars as pl
 import pyarrow as pa
+from typing import Any, Iterable
 
 __all__ = [
     "corpus_from_tesseract_table",
+    "corpus_from_tesseract_tables",
 ]
 
+# Tesseract's ordinal columns, from the outermost container (page) inwards.
+_ORDINALS = ["page_num", "block_num", "par_num", "line_num", "word_num"]
 
-def corpus_from_tesseract_table(ocr_table: pa.Table, document_id) -> Corpus:
+
+def _level_id(level: int, document_hash: int) -> pl.Expr:
     """
-    Convert a (PyArrow) Tesseract OCR table to a Corpus, with OCR tokens as its atoms.
+    ID of each row's level-`level` container (e.g. its page, for `level=1`).
 
-    An OCR token has, minimally:
-    * Text content.
-    * Ordinal information (to determine reading order).
-    * Spatial information (e.g. bounding box info). May be relative to a page
-      (e.g a fraction), or may be absolute (e.g. pixel amounts). In Tesseract
-      formats, absolute units are used.
+    Ordinals are cumulative along the whole document, so a level and that level's
+    ordinal identify a container within a document. They're packed into one integer
+    (level in the top 3 bits), and XOR-ed with the document's hash to keep documents
+    apart. For a row *at* that level, this is the row's own ID.
+    """
+    return (
+        pl.lit(level << 61, dtype=pl.UInt64)
+        .or_(pl.col(_ORDINALS[level - 1]).cast(pl.UInt64))
+        .xor(pl.lit(document_hash, dtype=pl.UInt64))
+    )
 
-    This function provides creates  a corpus with the following data:
-    * Atoms, with `text`, `ordinal`, bounding box, and `confidence` data.
-    * `page`, `block`, `paragraph`, and `line` chunks, each with `ordinal`, bounding
-      box, and parent data (where applicable)
-    * A `document` chunk that encompases all tokens from the Tesseract object (useful
-      in corpora with more than one document).
+
+def _with_tesseract_coord(atom: pa.Table) -> pa.Table:
+    """
+    Pack atoms' original Tesseract ordinal columns into one `tesseract_coord` struct
+    column. Done on the final Arrow table, where the struct shares its fields' buffers,
+    rather than building a struct for every row in the Polars query.
     """
-    ocr_table = pl.from_arrow(ocr_table)
+    names = [f"_tesseract_{ordinal}" for ordinal in _ORDINALS]
+    coord = pa.StructArray.from_arrays(
+        [atom[name].combine_chunks() for name in names], names=_ORDINALS
+    )
 
-    page, block, par, line, atom = (
-        ocr_table
+    return atom.drop_columns(names[1:]).set_column(
+        atom.schema.get_field_index(names[0]), "tesseract_coord", coord
+    )
+
+
+def _tesseract_rows(ocr_table: pa.Table | pl.DataFrame, document_id) -> pl.LazyFrame:
+    """
+    Build the (lazy) per-row query for one Tesseract OCR table: rows in reading order,
+    with cumulative ordinals, and the IDs of each row and its containers. Every corpus
+    table is derived from its result; see `_tesseract_frames()`.
+    """
+    document_hash = pl.select(pl.lit(document_id).hash()).item()
+
+    return (
+        # (Zero-copy, and lazy, so all of the per-row work runs as one query.)
+        (
+            ocr_table
+            if isinstance(ocr_table, pl.DataFrame)
+            else pl.from_arrow(ocr_table, rechunk=False)
+        )
+        .lazy()
+        # Narrow `level`, which every level filter and comparison below reads. (Only
+        # internal columns are narrowed; output columns keep the input's dtypes and
+        # values. The cast is strict, so out-of-range values raise rather than
+        # wrapping.)
+        .with_columns(pl.col("level").cast(pl.UInt8))
         # Ensure correct order, just to be safe
         .sort("page_num", "block_num", "par_num", "line_num", "word_num")
         .with_columns(
             document=pl.lit(document_id),
             # Make all ordinal values cumulative along the whole document, instead of
-            # resetting for each container type.
-            word_num=pl.when(pl.col("level") >= 5).then(
-                pl.col("level").eq(5).cum_sum()
-            ),
-            line_num=pl.when(pl.col("level") >= 4).then(
-                pl.col("level").eq(4).cum_sum()
-            ),
-            par_num=pl.when(pl.col("level") >= 3).then(pl.col("level").eq(3).cum_sum()),
-            block_num=pl.when(pl.col("level") >= 2).then(
-                pl.col("level").eq(2).cum_sum()
-            ),
-            page_num=pl.when(pl.col("level") >= 1).then(
-                pl.col("level").eq(1).cum_sum()
-            ),
+            # resetting for each container type. (Nulls for rows above that level.)
+            **{
+                ordinal: pl.when(pl.col("level") >= level).then(
+                    pl.col("level").eq(level).cum_sum()
+                )
+                for level, ordinal in enumerate(_ORDINALS, start=1)
+            },
             # Set nulls for levels that don't have valid conf/text values
             conf=pl.when(pl.col("level") == 5).then(pl.col("conf")),
             text=pl.when(pl.col("level") == 5).then(pl.col("text")),
-            # Store tesseract coordinates at atom level, for potential downstream use
-            tesseract_coord=pl.struct(
-                "page_num",
-                "block_num",
-                "par_num",
-                "line_num",
-                "word_num",
-            ),
+            # Store tesseract coordinates at atom level, for potential downstream use.
+            # (Kept as plain columns here; see `_with_tesseract_coord()`.)
+            **{f"_tesseract_{ordinal}": pl.col(ordinal) for ordinal in _ORDINALS},
         )
         .with_columns(
-            # Hash based on re-aligned ordinal values
-            id=pl.struct(
-                "document",
-                "page_num",
-                "block_num",
-                "par_num",
-                "line_num",
-                "word_num",
-            ).hash()
+            # IDs based on re-aligned ordinal values
+            id=pl.coalesce(
+                _level_id(level, document_hash) for level in range(5, 0, -1)
+            ),
+            # IDs of each row's containers. (Ordinals are cumulative, so a container's
+            # ID can be computed from any row inside it, without joining to it.)
+            page=_level_id(1, document_hash),
+            block=_level_id(2, document_hash),
+            paragraph=_level_id(3, document_hash),
+            line=_level_id(4, document_hash),
         )
-        # We know the output order will be page/block/etc. because of sorting.
-        .partition_by("level", maintain_order=True, include_key=False)
+    )
+
+
+def _tesseract_frames(rows: pl.DataFrame, document_id) -> list[pl.LazyFrame]:
+    """
+    Build (lazy) corpus tables for one document from its collected
+    `_tesseract_rows()`: the atoms, the document, page, block, paragraph and line
+    chunks, and then their atom relations (in that order).
+    """
+    # Split rows by level. Level only has 5 values, so 5 linear filters are cheaper
+    # than a group-by, and rows stay in page/block/etc. order within each level.
+    # Everything derived from the levels is built lazily, and collected together at
+    # the end (so independent tables can be built in parallel, from the same
+    # already-collected rows).
+    page, block, par, line, atom = (
+        rows.lazy().filter(pl.col("level") == level).drop("level")
+        for level in range(1, 6)
     )
 
     # Clean up tables.
     # NOTE: Everything above atoms is storing relationship data in the objects
     # (e.g. parent object IDs, like a block's page ID). That may not be the
     # best approach in the long run.
-    document = pl.DataFrame({"id": document_id})
+    document = pl.LazyFrame({"id": document_id})
 
     page = page.select(
         pl.col("document"),
@@ -89,9 +129,7 @@ def corpus_from_tesseract_table(ocr_table: pa.Table, document_id) -> Corpus:
         id=pl.col("id"),
     )
 
-    block = block.join(
-        page.rename({"id": "page"}), left_on="page_num", right_on="ordinal"
-    ).select(
+    block = block.select(
         pl.col("page"),
         pl.col("left"),
         pl.col("top"),
@@ -101,9 +139,7 @@ def corpus_from_tesseract_table(ocr_table: pa.Table, document_id) -> Corpus:
         id=pl.col("id"),
     )
 
-    par = par.join(
-        block.rename({"id": "block"}), left_on="block_num", right_on="ordinal"
-    ).select(
+    par = par.select(
         pl.col("block"),
         pl.col("left"),
         pl.col("top"),
@@ -113,9 +149,7 @@ def corpus_from_tesseract_table(ocr_table: pa.Table, document_id) -> Corpus:
         id=pl.col("id"),
     )
 
-    line = line.join(
-        par.rename({"id": "paragraph"}), left_on="par_num", right_on="ordinal"
-    ).select(
+    line = line.select(
         pl.col("paragraph"),
         pl.col("left"),
         pl.col("top"),
@@ -125,40 +159,14 @@ def corpus_from_tesseract_table(ocr_table: pa.Table, document_id) -> Corpus:
         id=pl.col("id"),
     )
 
-    # Record atom relations
-    document_atom = (
-        document.select(pl.col("id").alias("chunk"))
-        .join(atom, left_on=["chunk"], right_on=["document"])
-        .rename({"id": "atom"})
-        .select("chunk", "atom")
+    # Record atom relations. Each atom already has its containers' IDs, so every
+    # relation table is a slice of one projection of the atoms.
+    relations = atom.select(
+        "document", "page", "block", "paragraph", "line", atom=pl.col("id")
     )
-
-    page_atom = (
-        page.select(pl.col("id").alias("chunk"), "ordinal")
-        .join(atom, left_on=["ordinal"], right_on=["page_num"])
-        .rename({"id": "atom"})
-        .select("chunk", "atom")
-    )
-
-    block_atom = (
-        block.select(pl.col("id").alias("chunk"), "ordinal")
-        .join(atom, left_on=["ordinal"], right_on=["block_num"])
-        .rename({"id": "atom"})
-        .select("chunk", "atom")
-    )
-
-    paragraph_atom = (
-        par.select(pl.col("id").alias("chunk"), "ordinal")
-        .join(atom, left_on=["ordinal"], right_on=["par_num"])
-        .rename({"id": "atom"})
-        .select("chunk", "atom")
-    )
-
-    line_atom = (
-        line.select(pl.col("id").alias("chunk"), "ordinal")
-        .join(atom, left_on=["ordinal"], right_on=["line_num"])
-        .rename({"id": "atom"})
-        .select("chunk", "atom")
+    document_atom, page_atom, block_atom, paragraph_atom, line_atom = (
+        relations.select(pl.col(name).alias("chunk"), "atom")
+        for name in ("document", "page", "block", "paragraph", "line")
     )
 
     # Clean up atoms
@@ -171,22 +179,115 @@ def corpus_from_tesseract_table(ocr_table: pa.Table, document_id) -> Corpus:
         confidence=pl.col("conf"),
         ordinal=pl.col("word_num"),
         id=pl.col("id"),
-        tesseract_coord=pl.col("tesseract_coord"),
+        **{
+            f"_tesseract_{ordinal}": pl.col(f"_tesseract_{ordinal}")
+            for ordinal in _ORDINALS
+        },
         document=pl.col("document"),
     )
 
-    # Set up corpus (must use PyArrow tables!)
-    corpus = Corpus(atoms=atom.to_arrow())
+    return [
+        atom,
+        document,
+        page,
+        block,
+        par,
+        line,
+        document_atom,
+        page_atom,
+        block_atom,
+        paragraph_atom,
+        line_atom,
+    ]
 
-    # Add chunks
-    corpus.set_chunk(
-        "document", Chunks(corpus, document.to_arrow(), document_atom.to_arrow())
+
+def corpus_from_tesseract_table(
+    ocr_table: pa.Table | pl.DataFrame, document_id
+) -> Corpus:
+    """
+    Convert a Tesseract OCR table to a Corpus, with OCR tokens as its atoms. The table
+    can be a PyArrow table or a Polars DataFrame (used as-is, with no conversion).
+
+    An OCR token has, minimally:
+    * Text content.
+    * Ordinal information (to determine reading order).
+    * Spatial information (e.g. bounding box info). May be relative to a page
+      (e.g a fraction), or may be absolute (e.g. pixel amounts). In Tesseract
+      formats, absolute units are used.
+
+    This function provides creates  a corpus with the following data:
+    * Atoms, with `text`, `ordinal`, bounding box, and `confidence` data.
+    * `page`, `block`, `paragraph`, and `line` chunks, each with `ordinal`, bounding
+      box, and parent data (where applicable)
+    * A `document` chunk that encompases all tokens from the Tesseract object (useful
+      in corpora with more than one document).
+    """
+    return corpus_from_tesseract_tables([(ocr_table, document_id)])
+
+
+def corpus_from_tesseract_tables(
+    ocr_tables: Iterable[tuple[pa.Table | pl.DataFrame, Any]],
+) -> Corpus:
+    """
+    Convert several Tesseract OCR tables (one per document) into a single Corpus.
+    Equivalent to merging `corpus_from_tesseract_table()` results, but all documents
+    are processed together (one batch of Polars queries for their per-row work, then
+    one for their tables), so they're built in parallel.
+
+    Parameters
+    ----------
+    ocr_tables
+        `(ocr_table, document_id)` pairs. Each table can be a PyArrow table or a
+        Polars DataFrame.
+
+    Returns
+    -------
+    Corpus
+    """
+    ocr_tables = list(ocr_tables)
+    if not ocr_tables:
+        raise ValueError("At least one OCR table is required.")
+
+    # Run every document's per-row query (the bulk of the work) together, so
+    # documents are processed in parallel.
+    rows = pl.collect_all(
+        [_tesseract_rows(table, document_id) for table, document_id in ocr_tables]
     )
-    corpus.set_chunk("page", Chunks(corpus, page.to_arrow(), page_atom.to_arrow()))
-    corpus.set_chunk("block", Chunks(corpus, block.to_arrow(), block_atom.to_arrow()))
-    corpus.set_chunk(
-        "paragraph", Chunks(corpus, par.to_arrow(), paragraph_atom.to_arrow())
+    # Then build all of the documents' tables from those rows, also together.
+    frames = [
+        _tesseract_frames(doc_rows, document_id)
+        for doc_rows, (_, document_id) in zip(rows, ocr_tables)
+    ]
+    collected = pl.collect_all([frame for doc_frames in frames for frame in doc_frames])
+
+    (
+        atom,
+        document,
+        page,
+        block,
+        par,
+        line,
+        document_atom,
+        page_atom,
+        block_atom,
+        paragraph_atom,
+        line_atom,
+    ) = (
+        # Each table across all documents. Contiguous (single-chunk), so downstream
+        # lookups don't pay per-chunk costs. (`to_arrow` shares the Polars buffers
+        # rather than copying them.)
+        pl.concat(collected[i :: len(frames[0])], rechunk=True).to_arrow()
+        for i in range(len(frames[0]))
     )
-    corpus.set_chunk("line", Chunks(corpus, line.to_arrow(), line_atom.to_arrow()))
+
+    # Set up corpus (must use PyArrow tables!)
+    corpus = Corpus(atoms=_with_tesseract_coord(atom))
+
+    # Add chunks
+    corpus.set_chunk("document", Chunks(corpus, document, document_atom))
+    corpus.set_chunk("page", Chunks(corpus, page, page_atom))
+    corpus.set_chunk("block", Chunks(corpus, block, block_atom))
+    corpus.set_chunk("paragraph", Chunks(corpus, par, paragraph_atom))
+    corpus.set_chunk("line", Chunks(corpus, line, line_atom))
 
     return corpus
@@ -1,6 +1,15 @@
+from __future__ import annotations
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute
 from retrievall.core import Chunks, AttrExpr
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import (
+    HashingVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+from sklearn.pipeline import make_pipeline
+from typing import Literal
 
 __all__ = [
     "Tfidf",
@@ -12,7 +21,8 @@ class Tfidf(AttrExpr):
     Add a `tfidf` score column to chunks, based on their tfidf score
     relative to a `query` provided as a text string.
 
-    Uses a sklearn `TfidfVectorizer`; keyword arguments are passed to the TfidfVectorizer.
+    Uses a sklearn `TfidfVectorizer` by default; keyword arguments are passed to the
+    TfidfVectorizer.
 
     Parameters
     ----------
@@ -21,24 +31,140 @@ class Tfidf(AttrExpr):
         will be represented as strings for TF-IDF scoring.
     query
         Text string that chunks will be scored against for similarity.
+    algorithm : {"vocabulary", "hash"}
+        How terms are mapped to features.
+        * `vocabulary`
+            Build a vocabulary of every term seen (a `TfidfVectorizer`).
+        * `hash`
+            Hash terms into a fixed number of features (a `HashingVectorizer` followed
+            by a `TfidfTransformer`). Faster, and uses constant memory, at the cost of
+            occasional hash collisions between terms.
+    cache_size
+        Number of recent inputs to keep scores for, so scoring the same chunks' strings
+        again (e.g. the same chunks in another pipeline) skips refitting and
+        rescoring. Off (`0`) by default: each cached entry holds on to a copy of every
+        chunk's string, and every call has to hash all of its strings to check the
+        cache, even when it misses.
     kwargs
-        `TfidfVectorizer` keyword arguments that get passed to the vectorizer.
+        `TfidfVectorizer` keyword arguments that get passed to the vectorizer (`dtype`
+        defaults to `float32`, which is also the dtype of the scores). With
+        `algorithm="hash"`, IDF options (`norm`, `use_idf`, `smooth_idf`,
+        `sublinear_tf`) go to the `TfidfTransformer`, and the rest to the
+        `HashingVectorizer`.
     """
 
-    def __init__(self, stringifier: AttrExpr, query: str, **kwargs):
+    # `TfidfVectorizer` options that belong to the `TfidfTransformer` when hashing.
+    _TRANSFORMER_KWARGS = {"norm", "use_idf", "smooth_idf", "sublinear_tf"}
+
+    def __init__(
+        self,
+        stringifier: AttrExpr,
+        query: str,
+        *,
+        algorithm: Literal["vocabulary", "hash"] = "vocabulary",
+        cache_size: int = 0,
+        **kwargs,
+    ):
         self.stringifier = stringifier
         self.query = query
-        self.vectorizer = TfidfVectorizer(**kwargs)
+        self.algorithm = algorithm
+        # Single precision is plenty for scoring, and halves the memory the sparse
+        # products have to read.
+        kwargs.setdefault("dtype", np.float32)
+        self._dtype = kwargs["dtype"]
 
-    def __call__(self, chunks: Chunks) -> pa.Array:
+        if algorithm == "vocabulary":
+            self.vectorizer = TfidfVectorizer(**kwargs)
+        elif algorithm == "hash":
+            transformer_kwargs = {
+                k: kwargs.pop(k) for k in self._TRANSFORMER_KWARGS & kwargs.keys()
+            }
+            self.vectorizer = make_pipeline(
+                # (Normalization happens after IDF weighting, in the transformer.)
+                HashingVectorizer(
+                    **{"n_features": 2**18, "alternate_sign": False, **kwargs},
+                    norm=None,
+                ),
+                TfidfTransformer(**transformer_kwargs),
+            )
+        else:
+            raise ValueError('`algorithm` should be one of: "vocabulary", "hash"')
+
+        # Query vector from `fit()`, if the vectorizer has been fit ahead of time.
+        self._query_vec = None
+        # Scores of recent inputs, keyed by their strings (oldest first), if enabled.
+        # (A plain dict, rather than an `lru_cache` around a bound method, so the cache
+        # doesn't hold a reference back to this scorer.)
+        self._cache_size = cache_size
+        self._cache: dict[tuple[str, ...], pa.Array] = {}
+
+    def _strings(self, chunks: Chunks) -> list[str]:
         # (The stringifier is responsible for returning its strings
         # in the correct order for the input chunks.)
-        strings = self.stringifier(chunks).to_pylist()
+        # (Converted to Python strings once, since they're also the cache key, if
+        # caching. Chunks without any text are scored as empty strings.)
+        return pa.compute.fill_null(self.stringifier(chunks), "").to_pylist()
+
+    def fit(self, chunks: Chunks) -> Tfidf:
+        """
+        Learn the vocabulary and IDF weights once, from `chunks` (e.g. a whole corpus'
+        pages), rather than from whichever chunks are being scored. Later calls then
+        only transform their chunks, so scores are comparable across calls.
+
+        Parameters
+        ----------
+        chunks
+            Chunks to fit on.
+
+        Returns
+        -------
+        Tfidf
+            This scorer (fit), for chaining.
+        """
+        self.vectorizer.fit(self._strings(chunks))
+        self._query_vec = self.vectorizer.transform([self.query])
+        self._cache.clear()
+
+        return self
 
-        # Apply TF-IDF
-        chunk_vecs = self.vectorizer.fit_transform(strings)
-        query_vec = self.vectorizer.transform([self.query])
+    def _score_strings(self, strings: list[str]) -> pa.Array:
+        # Nothing to score (and nothing to fit a vocabulary on)
+        if not strings:
+            return pa.array(np.zeros(0, dtype=self._dtype))
 
-        scores = (chunk_vecs @ query_vec.transpose()).toarray().flatten()
+        # Apply TF-IDF (fitting on these strings, unless already fit)
+        if self._query_vec is None:
+            chunk_vecs = self.vectorizer.fit_transform(strings)
+            query_vec = self.vectorizer.transform([self.query])
+        else:
+            query_vec = self._query_vec
+            chunk_vecs = None
+
+        # No query terms appear in the chunks, so nothing can score above zero
+        if query_vec.nnz == 0:
+            return pa.array(np.zeros(len(strings), dtype=self._dtype))
+
+        if chunk_vecs is None:
+            chunk_vecs = self.vectorizer.transform(strings)
+
+        # (Sparse matrix times a dense vector: one pass over the chunks' nonzeros,
+        # rather than a sparse-sparse product materialized as a matrix.)
+        scores = chunk_vecs @ query_vec.toarray().ravel()
 
         return pa.array(scores)
+
+    def __call__(self, chunks: Chunks) -> pa.Array:
+        strings = self._strings(chunks)
+        if not self._cache_size:
+            return self._score_strings(strings)
+
+        key = tuple(strings)
+        # (Re-inserted on every hit, so the dict stays in least-recently-used order.)
+        scores = self._cache.pop(key, None)
+        if scores is None:
+            scores = self._score_strings(strings)
+            if len(self._cache) >= self._cache_size:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = scores
+
+        return scores
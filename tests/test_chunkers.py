@@ -20,6 +20,36 @@ class TestFixedSizeChunker:
         # 18 tokens in the doc, size 8 window with 6 offset == 3 chunks
         assert len(chunks) == 3
 
+    def test_disjoint_chunks(self, ocr_corpus):
+        corpus = ocr_corpus
+
+        # 18 tokens in chunks of 5 == 4 chunks (the last one has 3 tokens)
+        chunks = FixedSizeChunk(constrain_to="document", size=5)(corpus)
+        assert len(chunks) == 4
+        assert len(chunks.chunk_atoms) == 18
+
+        # With a gap of 1, chunks start at tokens 0, 6, and 12, skipping 3 tokens
+        chunks = FixedSizeChunk(constrain_to="document", size=5, offset=1)(corpus)
+        assert len(chunks) == 3
+        assert len(chunks.chunk_atoms) == 15
+
+    def test_chunk_order(self, ocr_corpus):
+        # Chunks come out in reading order (no sorting needed), for both disjoint and
+        # overlapping windows
+        for offset in [0, -1]:
+            chunks = FixedSizeChunk(constrain_to="document", size=3, offset=offset)(
+                ocr_corpus
+            )
+            texts = chunks.select(t=SimpleStringify())["t"].to_pylist()
+
+            assert texts[0] == "The (quick) [brown]"
+            assert texts[-1].endswith("sleepy fox")
+
+            # Repeated runs give the same order
+            for _ in range(3):
+                again = FixedSizeChunk(constrain_to="document", size=3, offset=offset)
+                assert again(ocr_corpus).chunks.equals(chunks.chunks)
+
     def test_constrained_chunks(self, ocr_corpus):
         corpus = ocr_corpus
         # Lines are 2-3 words, so `3` for size and `-1` for offset gets us
@@ -52,6 +82,30 @@ class TestRegexMatchChunker:
         res = chunks.select(text=SimpleStringify(delimiter=" "))
         assert res["text"].to_pylist() == ["Over the <lazy>"]
 
+    def test_chunker_multiple_matches(self, ocr_corpus):
+        corpus = ocr_corpus
+        chunker = RegexMatchChunk(constrain_to="page", pattern=r"(?i)\bthe\b")
+
+        chunks = chunker(corpus)
+
+        # "The" and "the" on both pages
+        assert len(chunks) == 4
+
+        res = chunks.select(text=SimpleStringify(delimiter=" "))
+        assert sorted(res["text"].to_pylist()) == ["The", "The", "the", "the"]
+
+    def test_chunker_literals(self, ocr_corpus):
+        corpus = ocr_corpus
+        # Alternations of literals are matched without the regex engine
+        chunker = RegexMatchChunk(constrain_to="page", pattern="fox|dog")
+
+        chunks = chunker(corpus)
+
+        assert len(chunks) == 4
+
+        res = chunks.select(text=SimpleStringify(delimiter=" "))
+        assert sorted(res["text"].to_pylist()) == ["dog", "dog", "fox", "fox"]
+
     # Test multiple docs...
     def test_chunker_multidoc(self, tesseract_table):
         # Create two corpora from a repeated tesseract table.
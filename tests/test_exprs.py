@@ -1,7 +1,7 @@
 import pytest
 import pyarrow as pa
 import re
-from retrievall.chunkers import RegexMatchChunk
+from retrievall.chunkers import FixedSizeChunk, RegexMatchChunk
 from retrievall.exprs import (
     ChunkDelimitedStringify,
     SimpleStringify,
@@ -80,6 +80,21 @@ class TestAtomData:
         # repeats of `abc123`
         assert res["document"].to_pylist() == [["abc123"] * 2, ["abc123"] * 3]
 
+    def test_missing_atoms(self, ocr_corpus):
+        lines = ocr_corpus.chunk("line")
+        # Drop the atoms for all but the first line
+        first = lines.chunks["id"][0]
+        lines.chunk_atoms = lines.chunk_atoms.filter(
+            pa.compute.equal(lines.chunk_atoms["chunk"], first)
+        )
+
+        res = lines.select(t=AtomData("text"))
+
+        # Results stay aligned with the chunks; chunks without atoms get nulls
+        assert len(res) == len(lines)
+        assert res["t"][0].as_py() is not None
+        assert res["t"].null_count == len(lines) - 1
+
 
 class TestRegexCount:
     def test_expr(self, ocr_corpus):
@@ -118,6 +133,28 @@ class TestRegexCount:
             {"ordinal": 2, "rcount": 6},
         ]
 
+    def test_literals(self, ocr_corpus):
+        corpus = ocr_corpus
+
+        res = corpus.chunk("page").select(
+            "ordinal", rcount=RegexCount(SimpleStringify(), r"the|dog")
+        )
+
+        # Each page has one lowercase `the` and one `dog`
+        assert res.sort_by("ordinal").to_pylist() == [
+            {"ordinal": 1, "rcount": 2},
+            {"ordinal": 2, "rcount": 2},
+        ]
+
+    def test_unsupported(self):
+        # Flags without an inline equivalent are rejected up-front
+        with pytest.raises(ValueError):
+            RegexCount(SimpleStringify(), r"o", flags=re.ASCII)
+
+        # As are patterns the regex engine can't handle (look-arounds)
+        with pytest.raises(ValueError):
+            RegexCount(SimpleStringify(), r"(?<=f)o")
+
 
 class TestChunkOverlap:
     def test_expr(self, ocr_corpus):
@@ -189,6 +226,21 @@ class TestChunkOverlap:
             {"ordinal": 8, "overlap": 0},
         ]
 
+    def test_overlapping_chunk_b(self, ocr_corpus):
+        # Overlapping 2-atom windows: most atoms are in two chunk_bs, but should only
+        # be counted once.
+        res = ocr_corpus.chunk("page").select(
+            "ordinal",
+            overlap=ChunkOverlap(
+                chunk_b=FixedSizeChunk("page", size=2, offset=-1), agg="count"
+            ),
+        )
+
+        assert res.sort_by("ordinal").to_pylist() == [
+            {"ordinal": 1, "overlap": 9},
+            {"ordinal": 2, "overlap": 9},
+        ]
+
 
 class TestSimpleStringify:
     def test_expr(self, ocr_corpus):
@@ -213,6 +265,29 @@ class TestSimpleStringify:
             {"ordinal": 2, "t": "The?~groovy?minute!?dog?bounds?UPON?the?sleepy?fox"},
         ]
 
+    def test_cache(self, ocr_corpus):
+        pages = ocr_corpus.chunk("page")
+
+        # Joined text is reused across calls...
+        assert pages.joined_text("?")[1] is pages.joined_text("?")[1]
+
+        # ...including by chunks enriched from these ones
+        enriched = pages.enrich(t=SimpleStringify(delimiter="?"))
+        assert enriched.joined_text("?")[1] is pages.joined_text("?")[1]
+
+        # ...but not once the atoms change
+        ocr_corpus.atoms = ocr_corpus.atoms.set_column(
+            ocr_corpus.atoms.schema.get_field_index("text"),
+            "text",
+            pa.compute.utf8_upper(ocr_corpus.atoms["text"]),
+        )
+        res = pages.select("ordinal", t=SimpleStringify(delimiter="?"))
+
+        assert res.sort_by("ordinal")["t"].to_pylist() == [
+            "THE?(QUICK)?[BROWN]?FOX?JUMPS!?OVER?THE?<LAZY>?DOG",
+            "THE?~GROOVY?MINUTE!?DOG?BOUNDS?UPON?THE?SLEEPY?FOX",
+        ]
+
 
 class TestChunkDelimitedStringify:
     def test_expr(self, ocr_corpus):
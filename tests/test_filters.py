@@ -26,6 +26,10 @@ class TestThreshold:
         # Lines 2 and 6 have a `width` > 110
         assert res.sort_by("ordinal")["ordinal"].to_pylist() == [2, 6]
 
+        # Filtered-out chunks' atoms are dropped too; lines 2 and 6 have 3 atoms each
+        filtered = corpus.chunk("line").filter(Threshold("width", ">", 110))
+        assert len(filtered.chunk_atoms) == 6
+
         res = (
             corpus.chunk("line").filter(Threshold("width", ">=", 110)).select("ordinal")
         )
@@ -1,6 +1,7 @@
+import polars as pl
 import pyarrow as pa
 from retrievall import Chunks, Corpus
-from retrievall.ocr import corpus_from_tesseract_table
+from retrievall.ocr import corpus_from_tesseract_table, corpus_from_tesseract_tables
 
 
 class TestOCRCorpus:
@@ -24,6 +25,65 @@ class TestOCRCorpus:
         assert len(corpus.chunk("paragraph")) == 4
         assert len(corpus.chunk("line")) == 8
 
+    def test_from_polars(self, tesseract_table):
+        from_arrow = corpus_from_tesseract_table(tesseract_table, document_id="abc123")
+        from_polars = corpus_from_tesseract_table(
+            pl.from_arrow(tesseract_table), document_id="abc123"
+        )
+
+        assert from_polars.atoms.equals(from_arrow.atoms)
+        for name in ["document", "page", "block", "paragraph", "line"]:
+            assert from_polars.chunk(name).chunks.equals(from_arrow.chunk(name).chunks)
+
+    def test_schema(self, tesseract_table):
+        corpus = corpus_from_tesseract_table(tesseract_table, document_id="abc123")
+        input_types = {field.name: field.type for field in tesseract_table.schema}
+
+        # Columns carried over from the input keep the input's types.
+        atom_types = {field.name: field.type for field in corpus.atoms.schema}
+        for col in ["left", "top", "width", "height"]:
+            assert atom_types[col] == input_types[col]
+        assert atom_types["confidence"] == input_types["conf"]
+        assert atom_types["tesseract_coord"] == pa.struct(
+            [
+                pa.field(name, input_types[name])
+                for name in ["page_num", "block_num", "par_num", "line_num", "word_num"]
+            ]
+        )
+
+        page_types = {f.name: f.type for f in corpus.chunk("page").chunks.schema}
+        for col in ["width", "height"]:
+            assert page_types[col] == input_types[col]
+        for name in ["block", "paragraph", "line"]:
+            chunk_types = {f.name: f.type for f in corpus.chunk(name).chunks.schema}
+            for col in ["left", "top", "width", "height"]:
+                assert chunk_types[col] == input_types[col]
+
+    def test_values(self, tesseract_table):
+        # Precise confidences, and a negative (off-page) coordinate
+        conf = tesseract_table["conf"].to_pylist()
+        conf[4] = 96.123456789
+        left = tesseract_table["left"].to_pylist()
+        left[4] = -3
+        table = tesseract_table.set_column(
+            tesseract_table.schema.get_field_index("conf"), "conf", pa.array(conf)
+        ).set_column(
+            tesseract_table.schema.get_field_index("left"), "left", pa.array(left)
+        )
+
+        corpus = corpus_from_tesseract_table(table, document_id="abc123")
+
+        # Atom values come through unchanged
+        is_atom = pa.compute.equal(table["level"], 5)
+        assert corpus.atoms["confidence"].to_pylist() == (
+            table["conf"].filter(is_atom).to_pylist()
+        )
+        assert corpus.atoms["left"].to_pylist() == (
+            table["left"].filter(is_atom).to_pylist()
+        )
+        assert corpus.atoms["confidence"][0].as_py() == 96.123456789
+        assert corpus.atoms["left"][0].as_py() == -3
+
     def test_merge(self, tesseract_table):
         corpus1 = corpus_from_tesseract_table(tesseract_table, document_id="abc123")
         corpus2 = corpus_from_tesseract_table(tesseract_table, document_id="def456")
@@ -42,3 +102,53 @@ class TestOCRCorpus:
         assert len(merged.chunk("block")) == 4
         assert len(merged.chunk("paragraph")) == 8
         assert len(merged.chunk("line")) == 16
+
+    def test_from_tables(self, tesseract_table):
+        merged = Corpus.merge(
+            [
+                corpus_from_tesseract_table(tesseract_table, document_id="abc123"),
+                corpus_from_tesseract_table(tesseract_table, document_id="def456"),
+            ]
+        )
+        batched = corpus_from_tesseract_tables(
+            [(tesseract_table, "abc123"), (tesseract_table, "def456")]
+        )
+
+        # Same as building and merging the documents one at a time
+        assert batched.atoms.equals(merged.atoms)
+        for name in ["document", "page", "block", "paragraph", "line"]:
+            assert batched.chunk(name).chunks.equals(merged.chunk(name).chunks)
+            assert batched.chunk(name).chunk_atoms.equals(
+                merged.chunk(name).chunk_atoms
+            )
+
+    def test_ids(self, tesseract_table):
+        corpus = Corpus.merge(
+            [
+                corpus_from_tesseract_table(tesseract_table, document_id="abc123"),
+                corpus_from_tesseract_table(tesseract_table, document_id="def456"),
+            ]
+        )
+
+        # IDs are unique, even across documents with identical layouts
+        ids = pa.concat_arrays(
+            [corpus.atoms["id"].combine_chunks()]
+            + [
+                corpus.chunk(name).chunks["id"].combine_chunks()
+                for name in ["page", "block", "paragraph", "line"]
+            ]
+        )
+        assert pa.compute.count_distinct(ids).as_py() == len(ids)
+
+        # Parent IDs point at real chunks
+        for name, parent in [
+            ("block", "page"),
+            ("paragraph", "block"),
+            ("line", "paragraph"),
+        ]:
+            assert pa.compute.all(
+                pa.compute.is_in(
+                    corpus.chunk(name).chunks[parent],
+                    value_set=corpus.chunk(parent).chunks["id"].combine_chunks(),
+                )
+            ).as_py()
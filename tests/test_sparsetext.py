@@ -1,5 +1,8 @@
 import pytest
+import pyarrow as pa
+import weakref
 from retrievall.exprs import SimpleStringify
+from retrievall.filters import EqualTo, Threshold
 from retrievall.sparsetext import (
     Tfidf,
 )
@@ -21,3 +24,78 @@ class TestTfidf:
             {"ordinal": 1, "tfidf": pytest.approx(0.501, abs=1e-3)},
             {"ordinal": 2, "tfidf": pytest.approx(0.501, abs=1e-3)},
         ]
+
+    def test_cache(self, ocr_corpus):
+        pages = ocr_corpus.chunk("page")
+
+        for cache_size, fits in [(0, 2), (1, 1)]:
+            tfidf = Tfidf(SimpleStringify(), query="the", cache_size=cache_size)
+            # Count how many times the vectorizer gets fit
+            calls = []
+            fit_transform = tfidf.vectorizer.fit_transform
+
+            def counted_fit_transform(*args, _fit_transform=fit_transform, **kwargs):
+                calls.append(args)
+                return _fit_transform(*args, **kwargs)
+
+            tfidf.vectorizer.fit_transform = counted_fit_transform
+
+            first = pages.select(tfidf=tfidf)
+            second = pages.select(tfidf=tfidf)
+
+            # With a cache, the second call reuses the first's fit and scores
+            assert len(calls) == fits
+            assert first.equals(second)
+
+            # The cache doesn't keep the scorer alive (no reference cycle)
+            scorer = weakref.ref(tfidf)
+            del tfidf
+            assert scorer() is None
+
+    def test_hash(self, ocr_corpus):
+        lines = ocr_corpus.chunk("line")
+
+        # Without hash collisions, hashed features score the same as a vocabulary
+        vocab = lines.select(t=Tfidf(SimpleStringify(), query="the dog"))
+        hashed = lines.select(
+            t=Tfidf(SimpleStringify(), query="the dog", algorithm="hash")
+        )
+
+        assert hashed["t"].to_pylist() == pytest.approx(vocab["t"].to_pylist())
+
+    def test_missing_text(self, ocr_corpus):
+        lines = ocr_corpus.chunk("line")
+        # Drop the atoms for all but the first line, so the others have no text
+        first = lines.chunks["id"][0]
+        lines.chunk_atoms = lines.chunk_atoms.filter(
+            pa.compute.equal(lines.chunk_atoms["chunk"], first)
+        )
+
+        res = lines.select(t=Tfidf(SimpleStringify(), query="the"))
+
+        assert res["t"].to_pylist()[1:] == [0] * (len(lines) - 1)
+
+    def test_no_matches(self, ocr_corpus):
+        pages = ocr_corpus.chunk("page")
+
+        # Query terms that aren't in any chunk score zero
+        res = pages.select(t=Tfidf(SimpleStringify(), query="zebra"))
+        assert res["t"].to_pylist() == [0, 0]
+
+        # No chunks, no scores
+        empty = pages.filter(Threshold("ordinal", ">", 100))
+        res = empty.select(t=Tfidf(SimpleStringify(), query="the"))
+        assert len(res) == 0
+
+    def test_fit(self, ocr_corpus):
+        pages = ocr_corpus.chunk("page")
+        first_page = pages.filter(EqualTo("ordinal", [1]))
+
+        # Fit on all pages, then score just one: same score as scoring all pages
+        tfidf = Tfidf(SimpleStringify(), query="the quick").fit(pages)
+        res = first_page.select(t=tfidf)
+        all_pages = pages.select("ordinal", t=Tfidf(SimpleStringify(), "the quick"))
+
+        assert res["t"].to_pylist() == pytest.approx(
+            all_pages.sort_by("ordinal")["t"].to_pylist()[:1]
+        )